@@ -0,0 +1,58 @@
+import os
+from unittest.mock import patch
+
+from tver_dl import config as config_module
+from tver_dl.config import ConfigManager
+
+CONFIG_YAML = """
+download_path: ./downloads
+series:
+  ドラマ:
+    - name: テスト番組
+      url: https://tver.jp/series/abc123
+"""
+
+
+class TestConfigLoad:
+    def test_categorized_series_normalized(self, tmp_path):
+        path = tmp_path / "config.yaml"
+        path.write_text(CONFIG_YAML, encoding="utf-8")
+        config = ConfigManager(str(path)).load()
+        series = config["series"][0]
+        assert series["category"] == "ドラマ"
+        assert series["target_seasons"] == ["本編"]
+
+    def test_unchanged_file_parsed_once(self, tmp_path):
+        path = tmp_path / "config.yaml"
+        path.write_text(CONFIG_YAML, encoding="utf-8")
+        manager = ConfigManager(str(path))
+        with patch.object(config_module.yaml, "load", wraps=config_module.yaml.load) as load:
+            first = manager.load()
+            second = manager.load()
+        assert load.call_count == 1
+        assert first == second
+        assert first is not second
+
+    def test_modified_file_reparsed(self, tmp_path):
+        path = tmp_path / "config.yaml"
+        path.write_text(CONFIG_YAML, encoding="utf-8")
+        manager = ConfigManager(str(path))
+        manager.load()
+        path.write_text(CONFIG_YAML.replace("./downloads", "./other"), encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert manager.load()["download_path"] == "./other"
+
+
+class TestDefaultConfig:
+    def test_missing_config_created_and_loadable(self, tmp_path):
+        path = tmp_path / "tver-dl" / "config.yaml"
+        ConfigManager(str(path)).load()
+        assert path.exists()
+        config = ConfigManager(str(path)).load()
+        assert config["series"][0]["exclude_patterns"] == ["予告", "ダイジェスト", "解説放送版"]
+
+    def test_default_config_written_as_utf8(self, tmp_path):
+        path = tmp_path / "config.yaml"
+        ConfigManager(str(path)).load()
+        assert "予告" in path.read_bytes().decode("utf-8")
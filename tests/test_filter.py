@@ -1,6 +1,8 @@
 import logging
+from contextlib import nullcontext
+from unittest.mock import patch
 import pytest
-from tver_dl.filter import EpisodeFilter
+from tver_dl.filter import EpisodeFilter, _compile_filters
 
 
 @pytest.fixture
@@ -32,6 +34,11 @@ class TestNoFilters:
     def test_empty_patterns_includes_everything(self, filter):
         assert filter.should_download(ep(), {"include_patterns": [], "exclude_patterns": []})
 
+    def test_null_patterns_includes_everything(self, filter):
+        # A bare `exclude_patterns:` key in YAML loads as None
+        cfg = {"target_seasons": [], "include_patterns": None, "exclude_patterns": None}
+        assert filter.should_download(ep(), cfg)
+
 
 class TestExcludePatterns:
     def test_matching_exclude_pattern_excluded(self, filter):
@@ -55,3 +62,39 @@ class TestIncludePatterns:
     def test_exclude_takes_priority_over_include(self, filter):
         cfg = {"include_patterns": ["第1話"], "exclude_patterns": ["予告"]}
         assert not filter.should_download(ep(title="予告第1話"), cfg)
+
+
+class TestCompiledPatterns:
+    def test_patterns_compiled_once_per_pattern_set(self, filter):
+        cfg = {"include_patterns": ["第"], "exclude_patterns": ["予告"]}
+        assert filter.compile_for_series(cfg) is filter.compile_for_series(dict(cfg))
+
+    def test_compiled_patterns_shared_across_filters(self, filter):
+        cfg = {"include_patterns": ["第"], "exclude_patterns": ["予告"]}
+        other = EpisodeFilter(logging.getLogger("other"))
+        assert filter.compile_for_series(cfg) is other.compile_for_series(cfg)
+
+    def test_regex_metacharacters_matched_literally(self, filter):
+        cfg = {"include_patterns": ["(1)"], "exclude_patterns": ["*"]}
+        assert filter.should_download(ep(title="本編(1)"), cfg)
+        assert not filter.should_download(ep(title="本編1"), cfg)
+        assert not filter.should_download(ep(title="本編(1)*"), cfg)
+
+    def test_regex_fallback_without_ahocorasick(self, filter):
+        cfg = {"include_patterns": ["＃", "第"], "exclude_patterns": ["予告"]}
+        with patch("tver_dl.filter.ahocorasick", None):
+            _compile_filters.cache_clear()
+            assert filter.should_download(ep(title="本編＃1"), cfg)
+            assert not filter.should_download(ep(title="予告＃1"), cfg)
+            assert not filter.should_download(ep(title="特別編"), cfg)
+        # Don't leak regex-fallback matchers into later tests via the shared cache
+        _compile_filters.cache_clear()
+
+    @pytest.mark.parametrize("aho", [True, False])
+    def test_empty_pattern_matches_everything(self, filter, aho):
+        with patch("tver_dl.filter.ahocorasick", None) if not aho else nullcontext():
+            _compile_filters.cache_clear()
+            assert filter.should_download(ep(title="本編"), {"include_patterns": [""]})
+            assert filter.should_download(ep(title="本編"), {"include_patterns": ["予告", ""]})
+            assert not filter.should_download(ep(title="本編"), {"exclude_patterns": [""]})
+        _compile_filters.cache_clear()
@@ -1,4 +1,5 @@
 import logging
+from unittest.mock import patch
 import pytest
 from tver_dl.tracker import CSVTracker, DatabaseTracker
 
@@ -34,6 +35,31 @@ class TestCSVTrackerHasEpisode:
         assert not csv_tracker.has_episode("https://tver.jp/episodes/ep003")
 
 
+class TestCSVTrackerBatch:
+    def test_returns_only_downloaded_urls(self, csv_tracker):
+        csv_tracker.add_download(SERIES, EPISODE, DOWNLOAD)
+        urls = [EPISODE["url"], "https://tver.jp/episodes/ep999"]
+        assert csv_tracker.has_episodes_batch(urls) == {EPISODE["url"]}
+
+    def test_empty_url_list_returns_empty_set(self, csv_tracker):
+        assert csv_tracker.has_episodes_batch([]) == set()
+
+
+class TestCSVTrackerCache:
+    def test_history_file_read_once(self, csv_tracker):
+        csv_tracker.add_download(SERIES, EPISODE, DOWNLOAD)
+        with patch.object(csv_tracker, "_load_urls", wraps=csv_tracker._load_urls) as load:
+            csv_tracker._urls = None
+            csv_tracker.has_episode(EPISODE["url"])
+            csv_tracker.has_episode("https://tver.jp/episodes/ep999")
+        assert load.call_count == 1
+
+    def test_added_after_load_is_visible(self, csv_tracker):
+        assert not csv_tracker.has_episode(EPISODE["url"])
+        csv_tracker.add_download(SERIES, EPISODE, DOWNLOAD)
+        assert csv_tracker.has_episode(EPISODE["url"])
+
+
 class TestCSVTrackerPersistence:
     def test_history_persists_across_instances(self, tmp_path):
         path = tmp_path / "history.csv"
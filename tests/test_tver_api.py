@@ -1,8 +1,12 @@
 import json
 import logging
+import ssl
+import urllib.error
+import urllib.request
 from io import BytesIO
 from unittest.mock import MagicMock, patch
 import pytest
+import urllib3
 from tver_dl.tver_api import TVerClient
 
 
@@ -49,7 +53,6 @@ class TestCallApi:
         assert "platform_uid=custom" in req.full_url
 
     def test_http_error_returns_empty_dict(self, client):
-        import urllib.error
         with patch.object(client, "_send_request", side_effect=urllib.error.HTTPError(
             url="https://example.com", code=404, msg="Not Found", hdrs={}, fp=None
         )):
@@ -62,6 +65,46 @@ class TestCallApi:
         assert result == {}
 
 
+class TestSendRequest:
+    def test_reads_body_through_pool(self, client):
+        pool_resp = MagicMock(status=200, data=b'{"ok": true}')
+        with patch.object(client._pool, "request", return_value=pool_resp) as mock_request:
+            with client._send_request(urllib.request.Request("https://example.com/api")) as resp:
+                assert json.loads(resp.read()) == {"ok": True}
+        assert mock_request.call_args[0][:2] == ("GET", "https://example.com/api")
+
+    def test_post_sets_form_content_type(self, client):
+        req = urllib.request.Request("https://example.com/api", data=b"device_type=pc",
+                                     method="POST")
+        pool_resp = MagicMock(status=200, data=b"{}")
+        with patch.object(client._pool, "request", return_value=pool_resp) as mock_request:
+            client._send_request(req)
+        headers = mock_request.call_args[1]["headers"]
+        assert headers["Content-Type"] == "application/x-www-form-urlencoded"
+
+    def test_error_status_raises_http_error(self, client):
+        pool_resp = MagicMock(status=404, reason="Not Found", data=b"")
+        with patch.object(client._pool, "request", return_value=pool_resp):
+            with pytest.raises(urllib.error.HTTPError):
+                client._send_request(urllib.request.Request("https://example.com/api"))
+
+    def test_cert_failure_falls_back_to_unverified(self, client):
+        error = urllib3.exceptions.SSLError("CERTIFICATE_VERIFY_FAILED")
+        with patch.object(client._pool, "request", side_effect=error), \
+                patch("tver_dl.tver_api.urllib3.PoolManager") as pool_cls:
+            pool_cls.return_value.request.return_value = MagicMock(status=200, data=b"{}")
+            client._send_request(urllib.request.Request("https://example.com/api"))
+        assert client.ssl_context.verify_mode == ssl.CERT_NONE
+        assert pool_cls.call_args[1]["cert_reqs"] == "CERT_NONE"
+
+    def test_pool_does_not_retry(self, client):
+        retries = urllib3.Retry.from_int(client._pool.connection_pool_kw["retries"])
+        assert retries.total is False
+
+    def test_pool_blocks_when_full(self, client):
+        assert client._pool.connection_pool_kw["block"] is True
+
+
 class TestGetSeriesEpisodes:
     SEASONS_RESP = {
         "result": {
@@ -116,3 +159,23 @@ class TestGetSeriesEpisodes:
         with patch.object(client, "_send_request", side_effect=responses):
             result = client.get_series_episodes("abc123", "テスト番組")
         assert result == []
+
+    def test_multiple_seasons_merged_in_season_order(self, client):
+        seasons = {"result": {"contents": [
+            {"type": "season", "content": {"id": f"s00{i}", "title": f"シーズン{i}"}}
+            for i in range(1, 4)
+        ]}}
+
+        def send(req):
+            if "callSeriesSeasons" in req.full_url:
+                return make_response(seasons)
+            s_id = req.full_url.split("callSeasonEpisodes/")[1].split("?")[0]
+            return make_response({"result": {"contents": [
+                {"type": "episode", "content": {"id": f"{s_id}-ep", "title": "第1話"}}
+            ]}})
+
+        with patch.object(client, "_send_request", side_effect=send):
+            episodes = client.get_series_episodes("abc123", "テスト番組")
+
+        assert [ep["id"] for ep in episodes] == ["s001-ep", "s002-ep", "s003-ep"]
+        assert [ep["season_name"] for ep in episodes] == ["シーズン1", "シーズン2", "シーズン3"]
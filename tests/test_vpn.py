@@ -0,0 +1,95 @@
+import logging
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from tver_dl.vpn import VPNChecker
+
+
+def make_response(data: dict):
+    resp = MagicMock()
+    resp.json.return_value = data
+    return resp
+
+
+def fake_get(responses: dict):
+    """Return a requests.get replacement that answers per service URL."""
+    def get(url, **kwargs):
+        result = responses[url]
+        if isinstance(result, Exception):
+            raise result
+        return make_response(result)
+    return get
+
+
+@pytest.fixture
+def checker():
+    return VPNChecker(logging.getLogger("test"))
+
+
+class TestVPNCheck:
+    def test_jp_from_any_service_passes(self, checker):
+        responses = {
+            "https://ipapi.co/json/": Exception("timeout"),
+            "https://ip.seeip.org/geoip": {"country_code": "US", "ip": "1.1.1.1"},
+            "https://api.myip.com": {"cc": "JP", "ip": "2.2.2.2"},
+        }
+        with patch.object(checker.session, "get", side_effect=fake_get(responses)):
+            assert checker.check() is True
+
+    def test_parses_json_once_per_response(self, checker):
+        resp = make_response({"country_code": "JP", "ip": "2.2.2.2"})
+        with patch.object(checker.session, "get", return_value=resp):
+            assert checker.check() is True
+        assert resp.json.call_count >= 1
+        assert resp.json.call_count == resp.raise_for_status.call_count
+
+    def test_non_jp_prompts_user(self, checker):
+        responses = {url: {"country_code": "US", "cc": "US", "ip": "1.1.1.1"}
+                     for url, _ in VPNChecker.SERVICES}
+        with patch.object(checker.session, "get", side_effect=fake_get(responses)), \
+                patch("sys.stdin.isatty", return_value=True), \
+                patch("builtins.input", return_value="n"):
+            assert checker.check() is False
+
+    def test_non_jp_without_tty_does_not_prompt(self, checker):
+        responses = {url: {"country_code": "US", "ip": "1.1.1.1"} for url, _ in VPNChecker.SERVICES}
+        with patch.object(checker.session, "get", side_effect=fake_get(responses)), \
+                patch("sys.stdin.isatty", return_value=False), \
+                patch("builtins.input") as mock_input:
+            assert checker.check() is False
+        mock_input.assert_not_called()
+
+    def test_non_jp_assume_yes_continues(self):
+        checker = VPNChecker(logging.getLogger("test"), assume_yes=True)
+        responses = {url: {"country_code": "US", "ip": "1.1.1.1"} for url, _ in VPNChecker.SERVICES}
+        with patch.object(checker.session, "get", side_effect=fake_get(responses)), \
+                patch("builtins.input") as mock_input:
+            assert checker.check() is True
+        mock_input.assert_not_called()
+
+    def test_first_check_creates_one_session(self, checker):
+        resp = make_response({"country_code": "JP", "ip": "2.2.2.2"})
+        with patch("requests.Session") as session_cls:
+            session_cls.return_value.get.return_value = resp
+            assert checker.check() is True
+        assert session_cls.call_count == 1
+
+
+class TestVPNCheckCache:
+    def test_confirmed_jp_not_rechecked_within_ttl(self, checker):
+        resp = make_response({"country_code": "JP", "ip": "2.2.2.2"})
+        with patch.object(checker.session, "get", return_value=resp) as get:
+            assert checker.check() is True
+            calls = get.call_count
+            assert checker.check() is True
+        assert get.call_count == calls
+
+    def test_rechecked_after_ttl(self, checker):
+        resp = make_response({"country_code": "JP", "ip": "2.2.2.2"})
+        with patch.object(checker.session, "get", return_value=resp) as get:
+            assert checker.check() is True
+            calls = get.call_count
+            checker._confirmed_at -= VPNChecker.CONFIRMED_TTL
+            assert checker.check() is True
+        assert get.call_count > calls
@@ -0,0 +1,194 @@
+import logging
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+from yt_dlp.utils import DownloadError
+
+from tver_dl.ytdlp import YtDlpHandler
+
+
+@pytest.fixture
+def handler():
+    return YtDlpHandler({}, logging.getLogger("test"))
+
+
+class TestExtractEpisodes:
+    def test_playlist_entries_mapped(self, handler):
+        info = {"_type": "playlist", "entries": [
+            {"id": "ep001", "title": "第1話", "webpage_url": "https://tver.jp/episodes/ep001"},
+            None,
+        ]}
+        with patch("yt_dlp.YoutubeDL") as ydl_cls:
+            ydl_cls.return_value.extract_info.return_value = info
+            episodes = handler.extract_episodes("https://tver.jp/series/abc123")
+        assert episodes == [
+            {"id": "ep001", "title": "第1話", "url": "https://tver.jp/episodes/ep001"}
+        ]
+
+    def test_youtubedl_instance_reused(self, handler):
+        with patch("yt_dlp.YoutubeDL") as ydl_cls:
+            ydl_cls.return_value.extract_info.return_value = {"_type": "playlist", "entries": []}
+            handler.extract_episodes("https://tver.jp/series/abc123")
+            handler.extract_episodes("https://tver.jp/series/def456")
+        assert ydl_cls.call_count == 1
+
+    def test_extraction_error_returns_empty(self, handler):
+        with patch("yt_dlp.YoutubeDL") as ydl_cls:
+            ydl_cls.return_value.extract_info.side_effect = DownloadError("geo blocked")
+            assert handler.extract_episodes("https://tver.jp/series/abc123") == []
+
+
+class TestSubtitleFormatLookup:
+    def test_no_subtitle_returns_none(self, handler, tmp_path):
+        (tmp_path / "第1話.mp4").touch()
+        assert handler._subtitle_format_lookup(tmp_path)("第1話") is None
+
+    def test_finds_subtitle_in_subdirectory(self, handler, tmp_path):
+        (tmp_path / "番組").mkdir()
+        (tmp_path / "番組" / "第1話.ja.srt").touch()
+        assert handler._subtitle_format_lookup(tmp_path)("第1話") == "srt"
+
+    def test_prefers_vtt(self, handler, tmp_path):
+        (tmp_path / "第1話.ja.srt").touch()
+        (tmp_path / "第1話.ja.vtt").touch()
+        assert handler._subtitle_format_lookup(tmp_path)("第1話") == "vtt"
+
+    def test_title_with_glob_metacharacters(self, handler, tmp_path):
+        title = "[字] 第1話 何？*"
+        (tmp_path / f"{title}.ja.vtt").touch()
+        assert handler._subtitle_format_lookup(tmp_path)(title) == "vtt"
+
+    def test_title_matched_anywhere_in_name(self, handler, tmp_path):
+        (tmp_path / "番組").mkdir()
+        (tmp_path / "番組" / "番組 第1話.ja.srt").touch()
+        (tmp_path / "番組 第2話.ja.vtt").touch()
+        (tmp_path / "番組 第2話.ja.ass").touch()
+        (tmp_path / "番組 第3話.mp4").touch()
+        lookup = handler._subtitle_format_lookup(tmp_path)
+        assert lookup("第1話") == "srt"
+        assert lookup("第2話") == "vtt"
+        assert lookup("第3話") is None
+        assert lookup("[字] 第1話") is None
+
+    def test_walks_directory_once(self, handler, tmp_path):
+        (tmp_path / "第1話.ja.vtt").touch()
+        with patch("tver_dl.ytdlp.os.walk", wraps=os.walk) as walk:
+            lookup = handler._subtitle_format_lookup(tmp_path)
+            assert lookup("第1話") == "vtt"
+            assert lookup("第2話") is None
+        assert walk.call_count == 1
+
+
+class TestBuildDownloadCommand:
+    def test_adds_concurrent_fragments(self, handler):
+        cmd = handler._build_download_command(["https://tver.jp/episodes/ep001"], "/tmp/dl")
+        idx = cmd.index("--concurrent-fragments")
+        assert cmd[idx + 1] == "3"
+
+    def test_user_concurrent_fragments_respected(self):
+        handler = YtDlpHandler({"yt_dlp_options": ["-N", "8"]}, logging.getLogger("test"))
+        cmd = handler._build_download_command(["https://tver.jp/episodes/ep001"], "/tmp/dl")
+        assert "--concurrent-fragments" not in cmd
+        assert cmd[cmd.index("-N") + 1] == "8"
+
+        handler = YtDlpHandler({"yt_dlp_options": ["-N4"]}, logging.getLogger("test"))
+        cmd = handler._build_download_command(["https://tver.jp/episodes/ep001"], "/tmp/dl")
+        assert "--concurrent-fragments" not in cmd
+        assert "-N4" in cmd
+
+    def test_subtitles_only_skips_concurrent_fragments(self):
+        handler = YtDlpHandler({}, logging.getLogger("test"), subtitles_only=True)
+        cmd = handler._build_download_command(["https://tver.jp/episodes/ep001"], "/tmp/dl")
+        assert "--concurrent-fragments" not in cmd
+        assert "--skip-download" in cmd
+        assert cmd[cmd.index("-o") + 1] == "/tmp/dl/%(series)s/%(title)s"
+
+    def test_subtitles_only_replaces_user_output_and_sub_lang(self):
+        options = ["-o", "%(title)s.%(ext)s", "--sub-lang", "en", "--write-subs"]
+        handler = YtDlpHandler({"yt_dlp_options": options}, logging.getLogger("test"),
+                               subtitles_only=True)
+        cmd = handler._build_download_command(["https://tver.jp/episodes/ep001"], "/tmp/dl")
+        assert "%(title)s.%(ext)s" not in cmd
+        assert cmd.count("--sub-lang") == 1
+        assert cmd[cmd.index("--sub-lang") + 1] == "ja"
+
+
+class TestParseProgress:
+    def test_returns_fraction(self):
+        assert YtDlpHandler._parse_progress("PROGRESS|250|1000|ep001") == 0.25
+
+    def test_clamps_to_one(self):
+        assert YtDlpHandler._parse_progress("PROGRESS|1200|1000|ep001") == 1.0
+
+    def test_unknown_total_returns_none(self):
+        assert YtDlpHandler._parse_progress("PROGRESS|250|NA|ep001") is None
+
+    def test_malformed_line_returns_none(self):
+        assert YtDlpHandler._parse_progress("PROGRESS|garbage") is None
+
+
+FAKE_YTDLP = """
+import sys
+print("PROGRESS|500|1000|ep001", flush=True)
+print("RESULT:ep001|1|/tmp/第1話.mp4|第1話", flush=True)
+print("some error", file=sys.stderr)
+"""
+
+
+class TestDownload:
+    def test_parses_results_and_reports_progress(self, tmp_path):
+        handler = YtDlpHandler({"download_path": str(tmp_path)}, logging.getLogger("test"))
+        episodes = [{"id": "ep001", "title": "番組 第1話", "url": "https://tver.jp/episodes/ep001"}]
+        progress = []
+        cmd = [sys.executable, "-c", FAKE_YTDLP]
+        with patch.object(handler, "_build_download_command", return_value=cmd):
+            results = handler.download(episodes, "番組", progress.append)
+
+        assert progress == [0.5, 1.0]
+        assert len(results) == 1
+        assert results[0]["url"] == "https://tver.jp/episodes/ep001"
+        assert results[0]["episode_name"] == "番組 第1話"
+        assert results[0]["episode_number"] == "1"
+        assert results[0]["subtitles"] is False
+
+    def test_non_ascii_filepath_decoded_with_locale_encoding(self, tmp_path):
+        handler = YtDlpHandler({"download_path": str(tmp_path)}, logging.getLogger("test"))
+        line = "RESULT:ep001|1|/tmp/番組/第1話.mp4|第1話\n".encode("cp932")
+        cmd = [sys.executable, "-c", f"import sys; sys.stdout.buffer.write({line!r})"]
+        with patch.object(handler, "_build_download_command", return_value=cmd), \
+                patch("tver_dl.ytdlp.locale.getpreferredencoding", return_value="cp932"):
+            results = handler.download([{"id": "ep001", "title": "t", "url": "u"}], "番組")
+        assert results[0]["filepath"] == "/tmp/番組/第1話.mp4"
+
+    def test_failure_reports_stderr_tail(self, tmp_path, caplog):
+        handler = YtDlpHandler({"download_path": str(tmp_path)}, logging.getLogger("test"))
+        script = "import sys\nfor i in range(100): print(f'line {i}', file=sys.stderr)\nsys.exit(1)"
+        cmd = [sys.executable, "-c", script]
+        with patch.object(handler, "_build_download_command", return_value=cmd):
+            with caplog.at_level(logging.ERROR):
+                results = handler.download([{"id": "ep001", "title": "t", "url": "u"}], "番組")
+
+        assert results == []
+        message = caplog.records[-1].getMessage()
+        assert "line 99" in message
+        assert "line 0\n" not in message
+
+    def test_long_output_line_does_not_abort(self, tmp_path):
+        handler = YtDlpHandler({"download_path": str(tmp_path)}, logging.getLogger("test"))
+        script = "print('x' * 200_000)\nprint('RESULT:ep001|1|/tmp/a.mp4|第1話')"
+        cmd = [sys.executable, "-c", script]
+        with patch.object(handler, "_build_download_command", return_value=cmd):
+            results = handler.download([{"id": "ep001", "title": "t", "url": "u"}], "番組")
+        assert [r["url"] for r in results] == ["u"]
+
+    def test_stream_error_keeps_finished_results(self, tmp_path):
+        handler = YtDlpHandler({"download_path": str(tmp_path)}, logging.getLogger("test"))
+        script = "print('RESULT:ep001|1|/tmp/a.mp4|第1話', flush=True)\nprint('x' * 10_000)"
+        cmd = [sys.executable, "-c", script]
+        with patch.object(handler, "_build_download_command", return_value=cmd), \
+                patch("tver_dl.ytdlp._STREAM_LIMIT", 1024):
+            results = handler.download([{"id": "ep001", "title": "t", "url": "u"}], "番組")
+        assert [r["url"] for r in results] == ["u"]
+        assert results[0]["subtitles"] is False
@@ -1,9 +1,15 @@
 import argparse
 import json
 import logging
+import sys
 from pathlib import Path
 from importlib.metadata import version, PackageNotFoundError
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .core import TVerDownloader
 from .ytdlp import YtDlpHandler
 
@@ -13,7 +19,14 @@ def fetch_episodes_only(series_url: str):
     logging.basicConfig(level=logging.ERROR)
     handler = YtDlpHandler({}, logging.getLogger("fetcher"))
     episodes = handler.extract_episodes(series_url)
-    print(json.dumps(episodes))
+    # Encode straight to UTF-8 bytes, skipping the str -> stdout codec round-trip
+    if orjson:
+        payload = orjson.dumps(episodes, option=orjson.OPT_APPEND_NEWLINE)
+    else:
+        text = json.dumps(episodes, ensure_ascii=False, separators=(",", ":"))
+        payload = (text + "\n").encode("utf-8")
+    sys.stdout.buffer.write(payload)
+    sys.stdout.buffer.flush()
 
 
 def main():
@@ -28,6 +41,8 @@ def main():
     parser.add_argument("--fetch-episodes", help="Fetch episodes for a series URL")
     parser.add_argument("--config", help="Config file path")
     parser.add_argument("--skip-vpn-check", action="store_true", help="Skip VPN connection check")
+    parser.add_argument("--yes", "-y", action="store_true",
+                        help="Continue without prompting if the VPN check fails")
     parser.add_argument("--subtitles-only", action="store_true", help="Only download missing subtitle files")
     parser.add_argument("--max-workers", type=int, default=3, help="Maximum number of parallel downloads")
 
@@ -41,6 +56,7 @@ def main():
         config_path=args.config,
         debug=args.debug,
         subtitles_only=args.subtitles_only,
+        assume_yes=args.yes,
     )
     downloader.run(skip_vpn_check=args.skip_vpn_check, max_workers=args.max_workers)
 
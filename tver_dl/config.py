@@ -1,9 +1,25 @@
+import copy
 import os
 import sys
 import yaml
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+
+@lru_cache(maxsize=4)
+def _read_yaml(path: str, mtime_ns: int) -> Any:
+    """Parse a YAML file. Cached by (path, mtime) so unchanged files are parsed once."""
+    # Hand libyaml the raw bytes; it detects the encoding and decodes while parsing
+    return yaml.load(Path(path).read_bytes(), Loader=SafeLoader)
+
+
 class ConfigManager:
     """Handles configuration loading, validation, and defaults."""
     
@@ -58,7 +74,9 @@ class ConfigManager:
             return self.DEFAULT_CONFIG
 
         try:
-            config = yaml.safe_load(self.config_path.read_text()) or {}
+            mtime_ns = self.config_path.stat().st_mtime_ns
+            # Copy so normalization below never mutates the cached parse
+            config = copy.deepcopy(_read_yaml(str(self.config_path), mtime_ns)) or {}
         except Exception as e:
             print(f"Error loading config: {e}")
             return self.DEFAULT_CONFIG
@@ -108,7 +126,9 @@ class ConfigManager:
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
         
         self.config_path.write_text(
-            yaml.dump(self.DEFAULT_CONFIG, allow_unicode=True, default_flow_style=False)
+            yaml.dump(self.DEFAULT_CONFIG, Dumper=SafeDumper, allow_unicode=True,
+                      default_flow_style=False),
+            encoding="utf-8",  # _read_yaml hands libyaml raw bytes, which must be UTF-8
         )
         print(f"Created default config at {self.config_path}")
         print("Please edit the config file to add your series URLs")
@@ -2,7 +2,6 @@ import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List
-import re
 
 from rich.logging import RichHandler
 
@@ -13,13 +12,16 @@ from .ytdlp import YtDlpHandler
 from .display import DisplayManager
 from .tracker import CSVTracker, DatabaseTracker
 from .tver_api import TVerClient
+from .utils import SERIES_ID_RE
 
 class TVerDownloader:
     """Main application controller."""
 
-    def __init__(self, config_path: str = None, debug: bool = False, subtitles_only: bool = False):
+    def __init__(self, config_path: str = None, debug: bool = False, subtitles_only: bool = False,
+                 assume_yes: bool = False):
         self.debug = debug
         self.subtitles_only = subtitles_only
+        self.assume_yes = assume_yes
         
         # Initialize display first to get the shared console
         self.display = DisplayManager()
@@ -42,8 +44,9 @@ class TVerDownloader:
         # Override debug/subtitles from config if not set in args
         self.debug = self.debug or self.config.get("debug", False)
         self.subtitles_only = self.subtitles_only or self.config.get("subtitles_only", False)
+        self.assume_yes = self.assume_yes or self.config.get("assume_yes", False)
         
-        self.vpn_checker = VPNChecker(self.logger)
+        self.vpn_checker = VPNChecker(self.logger, self.assume_yes)
         self.filter = EpisodeFilter(self.logger)
         self.ytdlp = YtDlpHandler(self.config, self.logger, self.debug, self.subtitles_only)
         self.api = TVerClient(self.logger)
@@ -109,7 +112,7 @@ class TVerDownloader:
         self.display.update_status(task_id, "Extracting...")
         
         # Extract series ID from URL
-        match = re.search(r'series/([a-zA-Z0-9]+)', series_url)
+        match = SERIES_ID_RE.search(series_url)
         if not match:
             self.logger.error(f"Could not parse series ID from URL: {series_url}")
             self.display.update_status(task_id, "[red]Invalid URL")
@@ -138,15 +141,17 @@ class TVerDownloader:
         # - Are missing subtitles
         subtitle_retries = []
         if self.subtitles_only and isinstance(self.tracker, DatabaseTracker):
+            missing_subs = []
             if series.get("subtitles", True):
                 self.display.update_status(task_id, "Checking missing subs...")
                 missing_subs = self.tracker.get_episodes_needing_subtitles(series_url)
             
+            new_urls = {e["url"] for e in new_episodes}
             for missing in missing_subs:
                 # Need to map back to the full episode object format if possible, or construct enough
                 # We have url, title, episode_number from DB.
                 # We check if it is already in new_episodes to avoid duplicates
-                if not any(e['url'] == missing['url'] for e in new_episodes):
+                if missing["url"] not in new_urls:
                     # Reconstruct a minimal episode dict for downloader
                     # The downloader mainly needs 'url' and 'title'.
                     subtitle_retries.append({
@@ -159,7 +164,8 @@ class TVerDownloader:
             if subtitle_retries:
                 self.logger.info(f"Found {len(subtitle_retries)} episodes needing subtitle retry for {series_name}")
             elif not series.get("subtitles", True):
-                self.logger.debug(f"Skipped subtitle retry check for {series_name} (subtitles disabled)")
+                self.logger.debug("Skipped subtitle retry check for %s (subtitles disabled)",
+                                  series_name)
         
         final_download_list = new_episodes + subtitle_retries
 
@@ -207,7 +213,8 @@ class TVerDownloader:
 
     def _filter_archived(self, episodes: List[Dict]) -> List[Dict]:
         """Filter out episodes that are already in the history."""
-        return [ep for ep in episodes if not self.tracker.has_episode(ep["url"])]
+        downloaded = self.tracker.has_episodes_batch(ep["url"] for ep in episodes)
+        return [ep for ep in episodes if ep["url"] not in downloaded]
 
     def _print_summary(self):
         """Print the final download report."""
@@ -1,5 +1,51 @@
 import logging
-from typing import Dict
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Returns the first pattern found in a title, or None
+Matcher = Callable[[str], Optional[str]]
+
+
+def _compile_patterns(patterns: Iterable[str]) -> Optional[Matcher]:
+    """Compile substring patterns into a single-pass matcher (None if there are no patterns)."""
+    # Longest first: longer substrings are rarer, and the alternation then
+    # reports the most specific pattern when several overlap
+    patterns = sorted((str(p) for p in patterns), key=len, reverse=True)
+    if not patterns:
+        return None
+    if "" in patterns:
+        # An empty pattern is in every title, as with `"" in title`
+        return lambda title: ""
+
+    if ahocorasick:
+        automaton = ahocorasick.Automaton()
+        for pattern in patterns:
+            automaton.add_word(pattern, pattern)
+        automaton.make_automaton()
+        return lambda title: next((p for _, p in automaton.iter(title)), None)
+
+    # Fallback: one alternation regex of the escaped literals
+    regex = re.compile("|".join(re.escape(p) for p in patterns))
+
+    def search(title: str) -> Optional[str]:
+        match = regex.search(title)
+        return match.group(0) if match else None
+
+    return search
+
+
+@lru_cache(maxsize=128)
+def _compile_filters(
+    include_patterns: Tuple[str, ...], exclude_patterns: Tuple[str, ...]
+) -> Tuple[Optional[Matcher], Optional[Matcher]]:
+    """Compile (include, exclude) matchers, shared by every series with the same patterns."""
+    return _compile_patterns(include_patterns), _compile_patterns(exclude_patterns)
 
 class EpisodeFilter:
     """Filters episodes based on include/exclude patterns."""
@@ -7,44 +53,53 @@ class EpisodeFilter:
     def __init__(self, logger: logging.Logger):
         self.logger = logger
 
+    def compile_for_series(
+        self, series_config: Dict
+    ) -> Tuple[Optional[Matcher], Optional[Matcher]]:
+        """Return (include, exclude) matchers for a series, compiling each pattern set once."""
+        return _compile_filters(
+            tuple(series_config.get("include_patterns") or ()),
+            tuple(series_config.get("exclude_patterns") or ()),
+        )
+
     def should_download(self, episode: Dict, series_config: Dict) -> bool:
         """Check if episode should be downloaded based on series-specific filters."""
         title = episode.get("title", "")
         season_name = episode.get("season_name", "")
         
-        include_patterns = series_config.get("include_patterns", [])
-        exclude_patterns = series_config.get("exclude_patterns", [])
         target_seasons = series_config.get("target_seasons", [])
 
         # 1. Season Filtering (Priority)
         if target_seasons:
             if season_name in target_seasons:
-                self.logger.debug(f"  -> Included (season '{season_name}' matches target)")
+                self.logger.debug("  -> Included (season '%s' matches target)", season_name)
                 return True
             else:
-                self.logger.debug(f"  -> Excluded (season '{season_name}' not in targets)")
+                self.logger.debug("  -> Excluded (season '%s' not in targets)", season_name)
                 return False
 
         # If no patterns configured at all, check if we might want to default to "本編"?
         # For now, keep existing behavior: if no filters, download everything.
-        if not include_patterns and not exclude_patterns:
-            self.logger.debug(f"  No filters configured, including: {title}")
+        include_match, exclude_match = self.compile_for_series(series_config)
+        if not include_match and not exclude_match:
+            self.logger.debug("  No filters configured, including: %s", title)
             return True
 
-        self.logger.debug(f"Checking episode: {title} (Season: {season_name})")
+        self.logger.debug("Checking episode: %s (Season: %s)", title, season_name)
 
         # 2. Exclude Patterns
-        for pattern in exclude_patterns:
-            if pattern in title:
-                self.logger.debug(f"  -> Excluded (matched exclude pattern '{pattern}')")
+        if exclude_match:
+            pattern = exclude_match(title)
+            if pattern is not None:
+                self.logger.debug("  -> Excluded (matched exclude pattern '%s')", pattern)
                 return False
 
         # 3. Include Patterns
-        if include_patterns:
-            for pattern in include_patterns:
-                if pattern in title:
-                    self.logger.debug(f"  -> Included (matched include pattern '{pattern}')")
-                    return True
+        if include_match:
+            pattern = include_match(title)
+            if pattern is not None:
+                self.logger.debug("  -> Included (matched include pattern '%s')", pattern)
+                return True
             self.logger.debug("  -> Excluded (no include pattern matched)")
             return False
 
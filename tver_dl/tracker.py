@@ -2,11 +2,13 @@ import csv
 import logging
 import os
 import socket
-import re
+import threading
 from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, Iterable, Optional, Any, Set
+
+from .utils import SERIES_ID_RE
 
 try:
     import psycopg2
@@ -26,6 +28,10 @@ class BaseTracker(ABC):
         """Check if an episode URL is already in the history."""
         pass
 
+    def has_episodes_batch(self, urls: Iterable[str]) -> Set[str]:
+        """Return the subset of urls already in the history."""
+        return {url for url in urls if self.has_episode(url)}
+
     @abstractmethod
     def add_download(self, series_info: Dict, episode_info: Dict, download_info: Dict):
         """Record a successful download."""
@@ -39,6 +45,9 @@ class CSVTracker(BaseTracker):
     def __init__(self, history_file: Path, logger: logging.Logger):
         super().__init__(logger)
         self.history_file = Path(history_file)
+        # URL set loaded once on first lookup; series threads share it
+        self._urls: Optional[Set[str]] = None
+        self._lock = threading.Lock()
         self._ensure_file_exists()
 
     def _ensure_file_exists(self):
@@ -48,30 +57,42 @@ class CSVTracker(BaseTracker):
                 writer = csv.DictWriter(f, fieldnames=self.FIELDNAMES)
                 writer.writeheader()
 
-    def has_episode(self, url: str) -> bool:
+    def _load_urls(self) -> Optional[Set[str]]:
+        """Read every URL in the history file, or None if it can't be read."""
         if not self.history_file.exists():
-            return False
+            return set()
         try:
             with open(self.history_file, "r", newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row["url"] == url:
-                        return True
+                return {row["url"] for row in csv.DictReader(f)}
         except Exception as e:
             self.logger.error(f"Error reading CSV history: {e}")
-        return False
+            return None
+
+    def has_episode(self, url: str) -> bool:
+        return url in self.has_episodes_batch([url])
+
+    def has_episodes_batch(self, urls: Iterable[str]) -> Set[str]:
+        with self._lock:
+            if self._urls is None:
+                self._urls = self._load_urls()
+                if self._urls is None:
+                    return set()
+            return self._urls.intersection(urls)
 
     def add_download(self, series_info: Dict, episode_info: Dict, download_info: Dict):
         try:
-            with open(self.history_file, "a", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=self.FIELDNAMES)
-                writer.writerow({
-                    "series_name": series_info["name"],
-                    "episode_name": episode_info["title"],
-                    "url": episode_info["url"],
-                    "episode_number": episode_info.get("episode_number") or "",
-                    "subtitles": str(download_info.get("subtitles", False))
-                })
+            with self._lock:
+                with open(self.history_file, "a", newline="", encoding="utf-8") as f:
+                    writer = csv.DictWriter(f, fieldnames=self.FIELDNAMES)
+                    writer.writerow({
+                        "series_name": series_info["name"],
+                        "episode_name": episode_info["title"],
+                        "url": episode_info["url"],
+                        "episode_number": episode_info.get("episode_number") or "",
+                        "subtitles": str(download_info.get("subtitles", False))
+                    })
+                if self._urls is not None:
+                    self._urls.add(episode_info["url"])
         except Exception as e:
             self.logger.error(f"Error writing to CSV history: {e}")
 
@@ -93,24 +114,31 @@ class DatabaseTracker(BaseTracker):
             raise e
 
     def has_episode(self, url: str) -> bool:
+        return url in self.has_episodes_batch([url])
+
+    def has_episodes_batch(self, urls: Iterable[str]) -> Set[str]:
+        """Return the subset of urls already downloaded, using a single query."""
+        urls = list(urls)
+        if not urls:
+            return set()
         try:
             with self._get_connection() as conn:
                 with conn.cursor() as cur:
-                    # Check if episode exists and has a successful download
+                    # Episodes that exist and have a successful download
                     query = """
-                        SELECT 1 FROM downloads d
+                        SELECT e.episode_url FROM downloads d
                         JOIN episodes e ON d.episode_id = e.id
-                        WHERE e.episode_url = %s AND d.status = 'downloaded'
+                        WHERE e.episode_url = ANY(%s) AND d.status = 'downloaded'
                     """
-                    cur.execute(query, (url,))
-                    return cur.fetchone() is not None
+                    cur.execute(query, (urls,))
+                    return {row[0] for row in cur.fetchall()}
         except Exception as e:
             self.logger.error(f"Error checking DB history: {e}")
-            return False
+            return set()
 
     def _extract_series_id(self, url: str) -> str:
         """Extract series ID from URL safely."""
-        match = re.search(r'series/([a-zA-Z0-9]+)', url)
+        match = SERIES_ID_RE.search(url)
         if match:
             return match.group(1)
         # Fallback for unexpected formats
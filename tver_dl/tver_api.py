@@ -1,14 +1,23 @@
 
+import io
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 import urllib.request
 import urllib.parse
 import urllib.error
 import ssl
 import certifi
+import urllib3
 from typing import Dict, List, Optional
 from .utils import traverse_obj
 
+try:
+    from orjson import loads as _loads
+except ImportError:
+    # json.loads also accepts UTF-8 bytes, so no explicit decode is needed
+    _loads = json.loads
+
 class TVerClient:
     """Client for interactions with TVer's API."""
 
@@ -19,6 +28,9 @@ class TVerClient:
         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     }
 
+    # Seasons of one series fetched in parallel
+    MAX_SEASON_WORKERS = 4
+
     def __init__(self, logger: logging.Logger):
         self.logger = logger
         self.platform_uid = None
@@ -30,22 +42,47 @@ class TVerClient:
         except Exception as e:
             self.logger.warning(f"Failed to create secure SSL context: {e}. Defaulting to unverified.")
             self.ssl_context = ssl._create_unverified_context()
+        self._pool = self._create_pool()
             
         self._initialize_session()
 
+    def _create_pool(self) -> urllib3.PoolManager:
+        """Create a keep-alive connection pool shared by every API call (and series thread)."""
+        verified = self.ssl_context.verify_mode != ssl.CERT_NONE
+        cert_reqs = "CERT_REQUIRED" if verified else "CERT_NONE"
+        # retries=False: fail on the first error like urlopen did (the SSL fallback relies on it).
+        # block=True: series x season threads can outnumber maxsize; wait for a free
+        # connection instead of opening throwaway ones (and logging "pool is full")
+        return urllib3.PoolManager(num_pools=4, maxsize=8, block=True, ssl_context=self.ssl_context,
+                                   cert_reqs=cert_reqs, retries=False)
+
+    def _urlopen(self, req: urllib.request.Request) -> io.BytesIO:
+        """Send a urllib Request through the pool; raise HTTPError for 4xx/5xx like urlopen."""
+        headers = dict(req.header_items())
+        if req.data is not None and not req.has_header("Content-type"):
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        response = self._pool.request(req.get_method(), req.full_url,
+                                      body=req.data, headers=headers)
+        if response.status >= 400:
+            raise urllib.error.HTTPError(req.full_url, response.status, response.reason,
+                                         response.headers, None)
+        # Body is fully read, so the connection is already back in the pool
+        return io.BytesIO(response.data)
+
     def _send_request(self, req: urllib.request.Request):
         """Send request with SSL error handling and retry logic."""
         try:
-            return urllib.request.urlopen(req, context=self.ssl_context)
-        except urllib.error.URLError as e:
+            return self._urlopen(req)
+        except urllib3.exceptions.HTTPError as e:
             # Check if this is an SSL error
-            error_str = str(e.reason)
+            error_str = str(e)
             if "CERTIFICATE_VERIFY_FAILED" in error_str:
                 self.logger.warning("SSL verification failed. Falling back to unverified context.")
                 # Switch to unverified context for future requests too
                 self.ssl_context = ssl._create_unverified_context()
+                self._pool = self._create_pool()
                 # Retry immediately
-                return urllib.request.urlopen(req, context=self.ssl_context)
+                return self._urlopen(req)
             raise
 
     def _initialize_session(self):
@@ -56,7 +93,7 @@ class TVerClient:
         try:
             req = urllib.request.Request(url, data=data, headers=self._HEADERS, method='POST')
             with self._send_request(req) as response:
-                resp_json = json.loads(response.read().decode())
+                resp_json = _loads(response.read())
                 
             self.platform_uid = traverse_obj(resp_json, ('result', 'platform_uid'))
             self.platform_token = traverse_obj(resp_json, ('result', 'platform_token'))
@@ -90,7 +127,7 @@ class TVerClient:
             req = urllib.request.Request(url, headers=self._HEADERS)
             
             with self._send_request(req) as response:
-                return json.loads(response.read().decode())
+                return _loads(response.read())
                 
         except urllib.error.HTTPError as e:
             self.logger.error(f"HTTP Error calling {url}: {e.code} - {e.reason}")
@@ -129,46 +166,58 @@ class TVerClient:
 
         self.logger.debug(f"Found {len(season_ids)} seasons.")
 
-        # 2. Get Episodes for each Season
+        # 2. Get Episodes for each Season (fetched concurrently, merged in season order)
         season_counts = {}
-        for s_id in season_ids:
-            episodes_url = f'https://platform-api.tver.jp/service/api/v1/callSeasonEpisodes/{s_id}'
-            # This requires platform tokens
-            ep_data = self._call_api(episodes_url, query={})
-            
-            ep_contents = traverse_obj(ep_data, ('result', 'contents'), default=[])
-            
-            for item in ep_contents:
-                if item.get('type') == 'episode':
-                    content = item.get('content', {})
-                    ep_id = content.get('id')
-                    
-                    if not ep_id:
-                        continue
-                        
-                    # Extract metadata
-                    title = content.get('title', '')
-                    series_title = content.get('seriesTitle', '')
-                    broadcast_date = content.get('broadcastDateLabel', '')
-                    season_name = season_map.get(s_id, 'Unknown')
-                    
-                    # Construct full title
-                    full_title = f"{series_title} {title}".strip()
-                    
-                    ep_obj = {
-                        'id': ep_id,
-                        'title': full_title, # Using full title for filtering
-                        'episode_title': title, # Raw episode title
-                        'series_title': series_title,
-                        'season_name': season_name,
-                        'url': f'https://tver.jp/episodes/{ep_id}',
-                        'episode_number': content.get('no'),
-                        'broadcast_date': broadcast_date,
-                    }
+        workers = min(self.MAX_SEASON_WORKERS, len(season_ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            season_results = executor.map(
+                lambda s_id: self._get_season_episodes(s_id, season_map.get(s_id, 'Unknown')),
+                season_ids,
+            )
+            for season_episodes in season_results:
+                for ep_obj in season_episodes:
                     episodes.append(ep_obj)
+                    season_name = ep_obj['season_name']
                     season_counts[season_name] = season_counts.get(season_name, 0) + 1
 
         count_strs = [f"{name}: {count}" for name, count in season_counts.items()]
         counts_summary = ", ".join(count_strs) if count_strs else "0"
         self.logger.info(f"Found {len(episodes)} total episodes via API for {series_name} ({counts_summary}).")
         return episodes
+
+    def _get_season_episodes(self, season_id: str, season_name: str) -> List[Dict]:
+        """Fetch the episodes of a single season."""
+        episodes_url = f'https://platform-api.tver.jp/service/api/v1/callSeasonEpisodes/{season_id}'
+        # This requires platform tokens
+        ep_data = self._call_api(episodes_url, query={})
+        
+        ep_contents = traverse_obj(ep_data, ('result', 'contents'), default=[])
+        
+        episodes = []
+        for item in ep_contents:
+            if item.get('type') == 'episode':
+                content = item.get('content', {})
+                ep_id = content.get('id')
+                
+                if not ep_id:
+                    continue
+                    
+                # Extract metadata
+                title = content.get('title', '')
+                series_title = content.get('seriesTitle', '')
+                broadcast_date = content.get('broadcastDateLabel', '')
+                
+                # Construct full title
+                full_title = f"{series_title} {title}".strip()
+                
+                episodes.append({
+                    'id': ep_id,
+                    'title': full_title, # Using full title for filtering
+                    'episode_title': title, # Raw episode title
+                    'series_title': series_title,
+                    'season_name': season_name,
+                    'url': f'https://tver.jp/episodes/{ep_id}',
+                    'episode_number': content.get('no'),
+                    'broadcast_date': broadcast_date,
+                })
+        return episodes
@@ -1,6 +1,10 @@
 
+import re
 from typing import Any, Callable, Dict, List, Optional, Union
 
+# Series ID in a TVer series URL, e.g. https://tver.jp/series/sr9gfdf2ex
+SERIES_ID_RE = re.compile(r'series/([a-zA-Z0-9]+)')
+
 def traverse_obj(
     obj: Any,
     *paths: Any,
@@ -1,49 +1,96 @@
 import logging
-import requests
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import sys
+import time
+from typing import TYPE_CHECKING, Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+if TYPE_CHECKING:
+    import requests
 
 class VPNChecker:
     """Verifies VPN connection to Japan."""
     
     SERVICES = [
-        ("https://ipapi.co/json/", lambda r: r.json().get("country_code")),
-        ("https://ip.seeip.org/geoip", lambda r: r.json().get("country_code")),
-        ("https://api.myip.com", lambda r: r.json().get("cc")),
+        ("https://ipapi.co/json/", lambda data: data.get("country_code")),
+        ("https://ip.seeip.org/geoip", lambda data: data.get("country_code")),
+        ("https://api.myip.com", lambda data: data.get("cc")),
     ]
+    # Seconds a confirmed Japan IP is trusted before probing again
+    CONFIRMED_TTL = 300
 
-    def __init__(self, logger: logging.Logger):
+    def __init__(self, logger: logging.Logger, assume_yes: bool = False):
         self.logger = logger
+        self.assume_yes = assume_yes
+        self._confirmed_at: Optional[float] = None
+        self._session: Optional["requests.Session"] = None
+
+    @property
+    def session(self) -> "requests.Session":
+        """Pooled session so repeated probes reuse TCP/TLS connections (created on first use)."""
+        if self._session is None:
+            # Deferred: runs with --skip-vpn-check never need requests
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            self._session = requests.Session()
+            pool_size = len(self.SERVICES)
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            self._session.mount("https://", adapter)
+        return self._session
 
     def check(self) -> bool:
         """Check if connected to a VPN (trying multiple IP geolocation services in parallel)."""
+        confirmed_at = self._confirmed_at
+        if confirmed_at is not None and time.monotonic() - confirmed_at < self.CONFIRMED_TTL:
+            self.logger.debug("Japan IP confirmed recently, skipping VPN check")
+            return True
+
         self.logger.info("Checking VPN connection...")
         
-        connected = False
         details = "Unknown"
+        # Create the session here, not lazily on the pool threads, so they all share one
+        session = self.session
 
         def check_service(url, parser):
             try:
-                response = requests.get(url, timeout=5)
+                response = session.get(url, timeout=(2, 5))  # (connect, read)
                 response.raise_for_status()
-                country = parser(response)
-                ip = response.json().get("ip", "unknown")
-                return country, ip
+                data = response.json()
+                return parser(data), data.get("ip", "unknown")
             except Exception:
                 return None, None
 
-        with ThreadPoolExecutor(max_workers=len(self.SERVICES)) as executor:
-            futures = [executor.submit(check_service, url, parser) for url, parser in self.SERVICES]
-            
-            for future in as_completed(futures):
-                country, ip = future.result()
-                if country:
-                    if country == "JP":
-                        self.logger.info(f"✓ Connected via Japan IP ({ip})")
-                        return True
-                    details = f"Country: {country}, IP: {ip}"
+        # Don't use the executor as a context manager: its exit would block on
+        # the slower services even after one has already confirmed JP.
+        executor = ThreadPoolExecutor(max_workers=len(self.SERVICES))
+        try:
+            pending = {executor.submit(check_service, url, parser) for url, parser in self.SERVICES}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    country, ip = future.result()
+                    if country:
+                        if country == "JP":
+                            self.logger.info(f"✓ Connected via Japan IP ({ip})")
+                            self._confirmed_at = time.monotonic()
+                            return True
+                        details = f"Country: {country}, IP: {ip}"
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
         # If we get here, no service confirmed JP
         self.logger.warning(f"Not connected to Japan VPN (Last detected: {details})")
         print("  TVer downloads may fail without Japanese IP")
-        response = input("Continue anyway? (y/n): ")
-        return response.lower() == "y"
+        return self._confirm("Continue anyway? (y/n): ")
+
+    def _confirm(self, prompt: str) -> bool:
+        """Ask the user to continue, without blocking when there is no terminal to answer."""
+        if self.assume_yes:
+            self.logger.info("Continuing anyway (assume_yes)")
+            return True
+        if not sys.stdin.isatty():
+            self.logger.error(
+                "No interactive terminal to confirm; aborting (use --yes to continue anyway)"
+            )
+            return False
+        return input(prompt).lower() == "y"
@@ -1,10 +1,29 @@
+import asyncio
+import locale
 import logging
-import subprocess
+import os
 import sys
 import threading
-import re
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Callable
+from typing import TYPE_CHECKING, Dict, List, Optional, Callable, Tuple
+
+if TYPE_CHECKING:
+    from yt_dlp import YoutubeDL
+
+_RESULT_PREFIX = "RESULT:"
+_PROGRESS_PREFIX = "PROGRESS|"
+_PROGRESS_TEMPLATE = (
+    "%(progress.downloaded_bytes)s|"
+    "%(progress.total_bytes,progress.total_bytes_estimate)s|"
+    "%(info.id)s"
+)
+SUBTITLE_EXTENSIONS = ("vtt", "srt", "ass")
+DEFAULT_CONCURRENT_FRAGMENTS = 3
+_STDERR_TAIL_LINES = 20
+# asyncio caps lines at 64 KiB by default; user --print/-j or -v output can be longer
+_STREAM_LIMIT = 16 * 1024 * 1024
 
 class YtDlpHandler:
     """Handles interactions with yt-dlp for extraction and downloading."""
@@ -15,49 +34,61 @@ class YtDlpHandler:
         self.debug = debug
         self.subtitles_only = subtitles_only
         self.extract_lock = threading.Lock()
+        self._extract_ydl: Optional["YoutubeDL"] = None
+        self._download_options = self._prepare_download_options()
         self.download_report = {}
 
+    def _get_extract_ydl(self) -> "YoutubeDL":
+        """Return the shared in-process YoutubeDL used for extraction (created on first use).
+
+        Callers must hold extract_lock: a YoutubeDL instance is not thread-safe.
+        """
+        if self._extract_ydl is None:
+            # Deferred: downloads run yt-dlp as a subprocess, so only extraction needs the import
+            from yt_dlp import YoutubeDL
+
+            self._extract_ydl = YoutubeDL({
+                "quiet": True,
+                "no_warnings": True,
+                "skip_download": True,
+                "playlist_items": "1-10",
+                "socket_timeout": 60,
+                "logger": self.logger,
+            })
+        return self._extract_ydl
+
     def extract_episodes(self, series_url: str) -> List[Dict[str, str]]:
         """Use yt-dlp to extract episode URLs from a series page."""
+        from yt_dlp.utils import DownloadError
+
         try:
             self.logger.info(f"Using yt-dlp to extract episodes from: {series_url}")
-            
-            cmd = [
-                sys.executable, "-m", "yt_dlp",
-                "--skip-download",
-                "--print", "%(id)s|%(title)s|%(webpage_url)s",
-                "--no-warnings",
-                "--playlist-items", "1-10",
-                series_url,
-            ]
-
-            self.logger.debug(f"Running command: {' '.join(cmd)}")
 
             # Serialize extraction calls
             with self.extract_lock:
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-
-            if result.returncode != 0:
-                self.logger.error(f"yt-dlp extraction failed: {result.stderr}")
-                return []
-
-            episodes = []
-            for line in result.stdout.strip().splitlines():
-                if not line or "|" not in line:
-                    continue
-                
-                parts = line.split("|", 2)
-                if len(parts) >= 3:
-                    episodes.append({
-                        "id": parts[0],
-                        "title": parts[1],
-                        "url": parts[2]
-                    })
-                    self.logger.debug(f"Found episode: {parts[1]} - {parts[2]}")
+                info = self._get_extract_ydl().extract_info(series_url, download=False)
+
+            entries = info.get("entries") if info.get("_type") == "playlist" else [info]
+
+            episodes = [
+                {
+                    "id": entry.get("id"),
+                    "title": entry.get("title"),
+                    "url": entry.get("webpage_url"),
+                }
+                for entry in entries or []
+                if entry
+            ]
+            if self.logger.isEnabledFor(logging.DEBUG):
+                for ep in episodes:
+                    self.logger.debug("Found episode: %s - %s", ep['title'], ep['url'])
 
             self.logger.info(f"yt-dlp found {len(episodes)} episode(s)")
             return episodes
 
+        except DownloadError as e:
+            self.logger.error(f"yt-dlp extraction failed: {e}")
+            return []
         except Exception as e:
             self.logger.error(f"Error extracting episodes: {e}", exc_info=self.debug)
             return []
@@ -75,10 +106,13 @@ class YtDlpHandler:
             Path(download_path).mkdir(parents=True, exist_ok=True)
             
             # Filter for subtitles only if requested
-            episode_urls = self._prepare_download_list(episodes, download_path)
-            if not episode_urls:
-                self.logger.info("No episodes need downloading (subtitles check passed).")
-                return []
+            if self.subtitles_only:
+                episode_urls = self._prepare_download_list(episodes, download_path)
+                if not episode_urls:
+                    self.logger.info("No episodes need downloading (subtitles check passed).")
+                    return []
+            else:
+                episode_urls = [ep["url"] for ep in episodes]
 
             # Create a lookup map for episodes by ID/URL to easily merge metadata later
             ep_map = {ep["url"]: ep for ep in episodes}
@@ -94,71 +128,26 @@ class YtDlpHandler:
             # Format: ID|EpisodeNumber|Filepath|Title
             cmd.extend(["--print", "after_move:RESULT:%(id)s|%(episode_number)s|%(filepath)s|%(title)s"])
 
-            # Enable progress output even if we capture stdout
-            if "--progress" not in cmd:
-                cmd.append("--progress")
-            # Force progress to be strictly on stdout or handled via newline
-            # yt-dlp defaults to carriage return for progress. We want newlines or we handle CR.
-            # Actually, readline() handles \n. yt-dlp progress uses \r.
-            # We can use "--newline" to force newlines for progress, making readline() work for progress too.
-            cmd.append("--newline")
+            # Replace yt-dlp's decorative progress output with a machine-readable line:
+            # PROGRESS|downloaded_bytes|total_bytes|id (--newline keeps it one line per update)
+            cmd.extend([
+                "--quiet", "--no-warnings", "--progress", "--newline",
+                "--progress-template", f"download:{_PROGRESS_PREFIX}{_PROGRESS_TEMPLATE}",
+            ])
 
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1, universal_newlines=True)
-            
             success_results = []
-            stdout_lines = []
-            completed_count = 0
-
-            while True:
-                line = process.stdout.readline()
-                if not line and process.poll() is not None:
-                    break
-                if line:
-                    stdout_lines.append(line)
-                    stripped_line = line.strip()
-                    
-                    # Check for progress
-                    # [download]  23.5% of 10.00MiB ...
-                    progress_match = re.search(r'\[download\]\s+(\d+\.?\d*)%', stripped_line)
-                    if progress_match and progress_callback:
-                        percent = float(progress_match.group(1))
-                        # Total progress = completed episodes + current partial
-                        total_progress = completed_count + (percent / 100.0)
-                        progress_callback(total_progress)
-                    
-                    # Check for our custom output
-                    if stripped_line.startswith("RESULT:"):
-                        try:
-                            # Parse result
-                            _, data = stripped_line.split("RESULT:", 1)
-                            vid_id, ep_num, filepath, title = data.split("|", 3)
-                            
-                            original_ep = next((e for e in episodes if e.get("id") == vid_id), None)
-                            url = original_ep["url"] if original_ep else "unknown"
-                            ep_title = original_ep["title"] if original_ep else title
-
-                            success_results.append({
-                                "series_name": series_name,
-                                "episode_name": ep_title,
-                                "url": url,
-                                "episode_number": ep_num if ep_num != "NA" else None,
-                                "filepath": filepath
-                            })
-                            
-                            # Increment completed count
-                            completed_count += 1
-                            if progress_callback:
-                                progress_callback(float(completed_count))
-
-                        except ValueError:
-                            pass # parsing error
-
-            stdout, stderr = process.communicate()
-            
+            try:
+                returncode, stderr = asyncio.run(self._run_download(
+                    cmd, episodes, series_name, success_results, progress_callback
+                ))
+            except Exception as e:
+                # Keep episodes that already finished so they are recorded, not downloaded again
+                returncode, stderr = None, str(e)
+
             # Additional processing for subtitles if needed (checks existence)
             self._process_download_results(success_results, download_path, series_name)
             
-            if process.returncode == 0:
+            if returncode == 0:
                 self.logger.info("✓ Download process completed")
                 return success_results
             else:
@@ -169,20 +158,107 @@ class YtDlpHandler:
             self.logger.error(f"✗ Download error: {e}", exc_info=self.debug)
             return []
 
-    def _prepare_download_list(self, episodes: List[Dict], download_path: str) -> List[str]:
-        """Prepare list of URLs, filtering for missing subtitles if needed."""
-        if not self.subtitles_only:
-            return [ep["url"] for ep in episodes]
+    async def _run_download(
+        self, cmd: List[str], episodes: List[Dict], series_name: str,
+        success_results: List[Dict], progress_callback: Optional[Callable[[float], None]],
+    ) -> Tuple[int, str]:
+        """Run yt-dlp, parsing stdout and draining stderr concurrently on one event loop.
+
+        Parsed downloads are appended to ``success_results`` as they complete.
+        Returns the process exit code and the last lines of its stderr output.
+        """
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+            limit=_STREAM_LIMIT,
+        )
+        # yt-dlp writes to a pipe in the locale encoding (what text=True decoded with)
+        encoding = locale.getpreferredencoding(False)
+        completed_count = 0
+
+        async def read_stdout():
+            nonlocal completed_count
+            async for raw_line in process.stdout:
+                stripped_line = raw_line.decode(encoding, errors="replace").strip()
+
+                # Check for progress
+                if stripped_line.startswith(_PROGRESS_PREFIX):
+                    if progress_callback:
+                        fraction = self._parse_progress(stripped_line)
+                        if fraction is not None:
+                            # Total progress = completed episodes + current partial
+                            progress_callback(completed_count + fraction)
+                    continue
+
+                # Check for our custom output
+                if stripped_line.startswith(_RESULT_PREFIX):
+                    try:
+                        # Parse result (prefix already matched, so slice it off)
+                        data = stripped_line[len(_RESULT_PREFIX):]
+                        vid_id, ep_num, filepath, title = data.split("|", 3)
+                    except ValueError:
+                        continue  # parsing error
+
+                    original_ep = next((e for e in episodes if e.get("id") == vid_id), None)
+                    url = original_ep["url"] if original_ep else "unknown"
+                    ep_title = original_ep["title"] if original_ep else title
+
+                    success_results.append({
+                        "series_name": series_name,
+                        "episode_name": ep_title,
+                        "url": url,
+                        "episode_number": ep_num if ep_num != "NA" else None,
+                        "filepath": filepath
+                    })
+
+                    # Increment completed count
+                    completed_count += 1
+                    if progress_callback:
+                        progress_callback(float(completed_count))
+
+        async def read_stderr() -> str:
+            # Stream stderr as well: log it live and keep only the tail for the error report
+            tail = deque(maxlen=_STDERR_TAIL_LINES)
+            async for raw_line in process.stderr:
+                line = raw_line.decode(encoding, errors="replace").rstrip()
+                self.logger.debug("yt-dlp: %s", line)
+                tail.append(line)
+            return "\n".join(tail)
 
-        download_dir = Path(download_path)
+        try:
+            _, stderr, returncode = await asyncio.gather(
+                read_stdout(), read_stderr(), process.wait()
+            )
+        except Exception:
+            # Don't leave yt-dlp running (or its transport open) once the loop closes
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+        return returncode, stderr
+
+    @staticmethod
+    def _parse_progress(line: str) -> Optional[float]:
+        """Return the completed fraction (0-1) from a PROGRESS line, or None if unknown."""
+        try:
+            _, downloaded, total, _ = line.split("|", 3)
+            downloaded_bytes, total_bytes = float(downloaded), float(total)
+        except ValueError:
+            return None  # NA values or malformed line
+        if total_bytes <= 0:
+            return None
+        return min(downloaded_bytes / total_bytes, 1.0)
+
+    def _prepare_download_list(self, episodes: List[Dict], download_path: str) -> List[str]:
+        """Prepare list of URLs for episodes that are still missing subtitles."""
+        subtitle_format = self._subtitle_format_lookup(Path(download_path))
         urls = []
         for ep in episodes:
-            if not self._has_subtitle(download_dir, ep["title"]):
+            if not subtitle_format(ep["title"]):
                 urls.append(ep["url"])
         return urls
 
-    def _build_download_command(self, urls: List[str], download_path: str) -> List[str]:
-        """Build the yt-dlp command based on configuration."""
+    def _prepare_download_options(self) -> Tuple[str, ...]:
+        """Derive the yt-dlp options shared by every download command (computed once)."""
         base_options = list(self.config.get("yt_dlp_options", []))
 
         if self.subtitles_only:
@@ -214,26 +290,30 @@ class YtDlpHandler:
                 except ValueError:
                     pass
             base_options.extend(["--sub-lang", "ja"])
-
-            # Explicitly set output template for subtitles to avoid .unknown_video
-            # We use the config's output template if we can find it, otherwise default
-            # But wait, we just removed it. 
-            # If the user has a preferred structure, we should keep it but adapt it?
-            # Actually, yt-dlp might fail to name the subtitle correctly without the video.
-            # Let's enforce a standard template for subtitles-only to match what we expect
-            # or try to extract the user's template.
-            # A safe bet is:
             base_options.extend(["--convert-subs", "vtt"])
-            base_options.extend(["-o", f"{download_path}/%(series)s/%(title)s"])
+        elif not any(opt.startswith(("-N", "--concurrent-fragments")) for opt in base_options):
+            # Fetch HLS fragments in parallel unless yt_dlp_options already sets it
+            fragments = self.config.get("concurrent_fragments", DEFAULT_CONCURRENT_FRAGMENTS)
+            base_options.extend(["--concurrent-fragments", str(fragments)])
+
+        return tuple(base_options)
 
+    def _build_download_command(self, urls: List[str], download_path: str) -> List[str]:
+        """Build the yt-dlp command based on configuration."""
         cmd = [
             sys.executable, "-m", "yt_dlp",
             # No archive file here!
-            *base_options,
-            "-P", download_path,
-            *urls
+            *self._download_options,
         ]
-        
+
+        if self.subtitles_only:
+            # Explicitly set output template for subtitles to avoid .unknown_video.
+            # The user's -o was removed above since yt-dlp may fail to name the
+            # subtitle correctly without the video, so enforce a standard template.
+            cmd.extend(["-o", f"{download_path}/%(series)s/%(title)s"])
+
+        cmd.extend(["-P", download_path, *urls])
+
         if self.debug:
             cmd.append("-v")
             
@@ -241,12 +321,12 @@ class YtDlpHandler:
 
     def _process_download_results(self, results: List[Dict], download_path: str, series_name: str):
         """Check for subtitles and update report."""
-        download_dir = Path(download_path)
+        lookup_subtitle_format = self._subtitle_format_lookup(Path(download_path))
         
         for item in results:
             episode_name = item["episode_name"]
             # Check if subtitle exists for this episode
-            subtitle_format = self._get_subtitle_format(download_dir, episode_name)
+            subtitle_format = lookup_subtitle_format(episode_name)
             
             # Update the result item with subtitle status for history tracking
             item["subtitles"] = bool(subtitle_format)
@@ -258,18 +338,30 @@ class YtDlpHandler:
                 self.logger.warning(f"Missing subtitle for: {episode_name}")
                 self.download_report[series_name]["missing_subtitles"].append(episode_name)
 
-    def _has_subtitle(self, download_dir: Path, title: str) -> bool:
-        """Check if any subtitle file exists for the title."""
-        return bool(self._get_subtitle_format(download_dir, title))
-
-    def _get_subtitle_format(self, download_dir: Path, title: str) -> Optional[str]:
-        """Return the extension of the subtitle file if it exists."""
-        # Sanitize title for globbing if needed, though usually yt-dlp cleans it.
-        # We'll try to match the title in the filename.
-        # Note: glob might be sensitive to special chars in title.
-        for ext in ["vtt", "srt", "ass"]:
-            # Escape brackets for glob if they exist in title
-            safe_title = title.replace("[", "[[]").replace("]", "[]]")
-            if list(download_dir.glob(f"**/*{safe_title}*.{ext}")):
-                return ext
-        return None
+    def _build_subtitle_index(self, download_dir: Path) -> Dict[str, List[str]]:
+        """Walk download_dir once and map each subtitle extension to the file stems found."""
+        index: Dict[str, List[str]] = {ext: [] for ext in SUBTITLE_EXTENSIONS}
+        for _, _, files in os.walk(download_dir):
+            for name in files:
+                stem, _, ext = name.rpartition(".")
+                if ext in index:
+                    index[ext].append(stem)
+        return index
+
+    def _subtitle_format_lookup(self, download_dir: Path) -> Callable[[str], Optional[str]]:
+        """Return a memoized title -> subtitle format lookup backed by one directory walk.
+
+        Build a fresh lookup per phase: yt-dlp creates subtitle files between
+        the pre-download check and the post-download check.
+        """
+        index = self._build_subtitle_index(download_dir)
+
+        @lru_cache(maxsize=None)
+        def lookup(title: str) -> Optional[str]:
+            # Title anywhere in the file name; extensions in preference order (vtt > srt > ass)
+            return next(
+                (ext for ext in SUBTITLE_EXTENSIONS if any(title in stem for stem in index[ext])),
+                None,
+            )
+
+        return lookup